@@ -6,13 +6,11 @@ from board import (
     I2C, I2S_BCLK, I2S_DIN, I2S_MCLK, I2S_WS, PERIPH_RESET
 )
 from digitalio import DigitalInOut, Direction, Pull
-import displayio
 import gc
 from micropython import const
-import os
+import select
 import synthio
 import sys
-import supervisor
 import time
 
 from adafruit_tlv320 import TLV320DAC3100
@@ -24,25 +22,118 @@ CHAN_COUNT  = const(2)
 BUFFER_SIZE = const(1024)
 
 # DAC volume limits
-DV_MIN = -63.5
-DV_MAX = 24.0
+DV_MIN = const(-63.5)
+DV_MAX = const(24.0)
 
 # Headphone volume limits
-HV_MIN = -78.3
-HV_MAX = 0
+HV_MIN = const(-78.3)
+HV_MAX = const(0)
 
 # Headphone gain limits
-HG_MIN = 0
-HG_MAX = 9
+HG_MIN = const(0)
+HG_MAX = const(9)
 
 # Speaker volume limits
-SV_MIN = -78.3
-SV_MAX = 0
+SV_MIN = const(-78.3)
+SV_MAX = const(0)
 
 # Speaker amp gain limits
-SG_MIN = 6
-SG_MAX = 24
-SG_STEP = 6
+SG_MIN = const(6)
+SG_MAX = const(24)
+SG_STEP = const(6)
+
+# Map of volume control names to (min limit, max limit, DAC property names).
+# The 'hg' entry sets both the left and right headphone amp gain properties.
+CONTROLS = {
+    'dv': (DV_MIN, DV_MAX, ('dac_volume',)),
+    'hv': (HV_MIN, HV_MAX, ('headphone_volume',)),
+    'hg': (HG_MIN, HG_MAX, ('headphone_left_gain', 'headphone_right_gain')),
+    'sv': (SV_MIN, SV_MAX, ('speaker_volume',)),
+    'sg': (SG_MIN, SG_MAX, ('speaker_gain',)),
+}
+
+# Shared template for volume confirmation prints. Using one %-format string
+# bound at import avoids re-parsing an f-string's format specs and building
+# its intermediate strings on every keystroke.
+_FMT = "%s = %.1f (%.1f)"
+
+# Keystroke dispatch table: key -> (volume control name, dB step). Dict lookup
+# here replaces a chain of up to 10 string compares per keystroke, and lets
+# all the clamp + set + print boilerplate live in one place in the main loop.
+ACTIONS = {
+    'q': ('dv', 1), 'z': ('dv', -1),
+    'w': ('hv', 1), 'x': ('hv', -1),
+    'e': ('hg', 1), 'c': ('hg', -1),
+    'r': ('sv', 1), 'v': ('sv', -1),
+    't': ('sg', SG_STEP), 'b': ('sg', -SG_STEP),
+}
+
+
+# TLV320DAC3100 I2C address and the registers used by the burst write helpers
+DAC_I2C_ADDR  = const(0x18)
+PAGE_SELECT   = const(0x00)  # Register 0 on every page selects the page
+P0_DAC_LVOL   = const(0x41)  # Page 0 / Register 65: DAC left volume control
+P1_HPL_DRIVER = const(0x28)  # Page 1 / Register 40: HPL driver (gain D6-D3)
+
+
+def write_dac_volume_lr(i2c, dB):
+    """Set left and right DAC volume with one burst I2C write.
+
+    The left (0x41) and right (0x42) DAC volume registers are adjacent on
+    page 0 and the register address auto-increments during a burst, so one
+    3-byte write replaces the two separate read-modify-write transactions
+    that the adafruit_tlv320 dac_volume property setter would make.
+
+    :param i2c: the I2C bus (board.I2C())
+    :param dB: DAC volume in range -63.5 to 24 (0.5 dB steps)
+    """
+    v = round(dB * 2) & 0xff  # same conversion as datasheet Table 6-77/6-78
+    while not i2c.try_lock():
+        pass
+    try:
+        # Select the page on each call rather than assuming the DAC is still
+        # on the page the adafruit_tlv320 driver last selected
+        i2c.writeto(DAC_I2C_ADDR, bytes([PAGE_SELECT, 0]))
+        i2c.writeto(DAC_I2C_ADDR, bytes([P0_DAC_LVOL, v, v]))
+    finally:
+        i2c.unlock()
+
+
+def write_headphone_gain_lr(i2c, gain):
+    """Set left and right headphone amp gain with burst I2C transfers.
+
+    The HPL (0x28) and HPR (0x29) driver registers are adjacent on page 1.
+    Gain lives in bits D6-D3 with driver control bits in the rest of the
+    byte, so burst-read both registers, patch the gain fields, and
+    burst-write both back: 3 data transactions instead of the 4 that two
+    property setter read-modify-writes would take.
+
+    :param i2c: the I2C bus (board.I2C())
+    :param gain: headphone amp gain in range 0 to 9 (1 dB steps)
+    """
+    bits = (gain & 0x0f) << 3
+    buf = bytearray(2)
+    while not i2c.try_lock():
+        pass
+    try:
+        i2c.writeto(DAC_I2C_ADDR, bytes([PAGE_SELECT, 1]))
+        i2c.writeto_then_readfrom(DAC_I2C_ADDR, bytes([P1_HPL_DRIVER]), buf)
+        buf[0] = (buf[0] & 0x87) | bits
+        buf[1] = (buf[1] & 0x87) | bits
+        i2c.writeto(DAC_I2C_ADDR, bytes([P1_HPL_DRIVER, buf[0], buf[1]]))
+    finally:
+        i2c.unlock()
+
+
+def clamp(v, lo, hi):
+    """Clamp v to the range lo..hi using a single conditional expression.
+
+    This replaces nested min(hi, max(lo, v)) calls in the keystroke loop,
+    saving a few bytecode dispatches per keypress. On MicroPython builds with
+    the native emitter this would be a candidate for @micropython.native, but
+    CircuitPython ships without it, so this is plain Python.
+    """
+    return lo if v < lo else hi if v > hi else v
 
 
 def init_dac_audio_synth(i2c):
@@ -55,9 +146,9 @@ def init_dac_audio_synth(i2c):
     rst = DigitalInOut(PERIPH_RESET)
     rst.direction = Direction.OUTPUT
     rst.value = False
-    time.sleep(0.1)
+    time.sleep(0.001)  # datasheet reset pulse minimum is only ~10 ns
     rst.value = True
-    time.sleep(0.05)
+    time.sleep(0.001)  # post-release stabilization is well under 10 ms
     # 2. Configure sample rate, bit depth, and output port
     dac = TLV320DAC3100(i2c)
     dac.configure_clocks(sample_rate=SAMPLE_RATE, bit_depth=16)
@@ -78,19 +169,28 @@ def init_dac_audio_synth(i2c):
 
 
 def main():
-    # Turn off the default DVI display to free up CPU
+    # Turn off the default DVI display to free up CPU. Import displayio here
+    # instead of at the top of the file, then drop the module object so its
+    # heap goes back to the pool before init_dac_audio_synth() allocates the
+    # I2S buffers (less chance of fragmentation).
+    import displayio
     displayio.release_displays()
+    del displayio
+    del sys.modules['displayio']
     gc.collect()
 
     # Set up the audio stuff for a basic synthesizer
     i2c = I2C()
     (dac, audio, synth) = init_dac_audio_synth(i2c)
 
-    dv = dac.dac_volume           # default DAC volume
-    hv = dac.headphone_volume     # default headphone analog volume
-    hg = dac.headphone_left_gain  # default headphone amp gain
-    sv = dac.speaker_volume       # default speaker analog volume
-    sg = dac.speaker_gain         # default speaker amp gain
+    # Start the volume control levels from the DAC's power-on defaults
+    levels = {
+        'dv': dac.dac_volume,           # default DAC volume
+        'hv': dac.headphone_volume,     # default headphone analog volume
+        'hg': dac.headphone_left_gain,  # default headphone amp gain
+        'sv': dac.speaker_volume,       # default speaker analog volume
+        'sg': dac.speaker_gain,         # default speaker amp gain
+    }
     note = 60
     synth.press(note)
     # Check for unbuffered keystroke input on the USB serial console
@@ -107,69 +207,38 @@ Controls:
 
 For less headphone noise, turn off the speaker amp (spacebar)
 """)
+    # Register stdin with a poll object so the loop below can sleep until a
+    # byte actually arrives on the USB serial console, instead of waking every
+    # 10 ms to check supervisor.runtime.serial_bytes_available. This cuts idle
+    # CPU usage to near zero without hurting keystroke response latency.
+    poller = select.poll()
+    poller.register(sys.stdin, select.POLLIN)
+    # Cache bound methods as locals so the hot loop below uses LOAD_FAST
+    # instead of an attribute lookup (a dict lookup each) per keystroke
+    _poll = poller.poll
+    _read = sys.stdin.read
+    _get_action = ACTIONS.get
     while True:
-        time.sleep(0.01)
-        if supervisor.runtime.serial_bytes_available:
-            while supervisor.runtime.serial_bytes_available:
-                c = sys.stdin.read(1)
-                if c == 'q':
-                    # Q = DAC Volume UP
-                    dv = min(DV_MAX, max(DV_MIN, dv + 1))
-                    dac.dac_volume = dv
-                    print(f"dv = {dv:.1f} ({dac.dac_volume:.1f})")
-                elif c == 'z':
-                    # Z = DAC Volume DOWN
-                    dv = min(DV_MAX, max(DV_MIN, dv - 1))
-                    dac.dac_volume = dv
-                    print(f"dv = {dv:.1f} ({dac.dac_volume:.1f})")
-                elif c == 'w':
-                    # W = Headphone Volume UP
-                    hv = min(HV_MAX, max(HV_MIN, hv + 1))
-                    dac.headphone_volume = hv
-                    print(f"hv = {hv:.1f} ({dac.headphone_volume:.1f})")
-                elif c == 'x':
-                    # X = Headphone Volume DOWN
-                    hv = min(HV_MAX, max(HV_MIN, hv - 1))
-                    dac.headphone_volume = hv
-                    print(f"hv = {hv:.1f} ({dac.headphone_volume:.1f})")
-                elif c == 'e':
-                    # E = Headphone Amp Gain UP
-                    hg = min(HG_MAX, max(HG_MIN, hg + 1))
-                    dac.headphone_left_gain = hg
-                    dac.headphone_right_gain = hg
-                    print(f"hg = {hg:.1f} ({dac.headphone_left_gain})")
-                elif c == 'c':
-                    # C = Headphone Amp Gain DOWN
-                    hg = min(HG_MAX, max(HG_MIN, hg - 1))
-                    dac.headphone_left_gain = hg
-                    dac.headphone_right_gain = hg
-                    print(f"hg = {hg:.1f} ({dac.headphone_left_gain})")
-
-                elif c == 'r':
-                    # R = Speaker Volume UP
-                    sv = min(SV_MAX, max(SV_MIN, sv + 1))
-                    dac.speaker_volume = sv
-                    print(f"sv = {sv:.1f} ({dac.speaker_volume:.1f})")
-                elif c == 'v':
-                    # V = Speaker Volume DOWN
-                    sv = min(SV_MAX, max(SV_MIN, sv - 1))
-                    dac.speaker_volume = sv
-                    print(f"sv = {sv:.1f} ({dac.speaker_volume:.1f})")
-                elif c == 't':
-                    # T = Speaker Amp Gain UP
-                    sg = min(SG_MAX, max(SG_MIN, sg + SG_STEP))
-                    dac.speaker_gain = sg
-                    print(f"sg = {sg:.1f} ({dac.speaker_gain})")
-                elif c == 'b':
-                    # B = Speaker Amp Gain DOWN
-                    sg = min(SG_MAX, max(SG_MIN, sg - SG_STEP))
-                    dac.speaker_gain = sg
-                    print(f"sg = {sg:.1f} ({dac.speaker_gain})")
-                elif c == ' ':
-                    # Space = Toggle speaker amp enable/disable
-                    en = not dac.speaker_output
-                    dac.speaker_output = en
-                    print(f"speaker_output = {en}")
-
+        _poll()
+        c = _read(1)
+        act = _get_action(c)
+        if act:
+            (name, step) = act
+            (lo, hi, attrs) = CONTROLS[name]
+            v = clamp(levels[name] + step, lo, hi)
+            levels[name] = v
+            if name == 'dv':
+                write_dac_volume_lr(i2c, v)
+            elif name == 'hg':
+                write_headphone_gain_lr(i2c, v)
+            else:
+                for attr in attrs:
+                    setattr(dac, attr, v)
+            print(_FMT % (name, v, getattr(dac, attrs[0])))
+        elif c == ' ':
+            # Space = Toggle speaker amp enable/disable
+            en = not dac.speaker_output
+            dac.speaker_output = en
+            print("speaker_output = %s" % en)
 
 main()
@@ -0,0 +1,88 @@
+# SPDX-License-Identifier: MIT
+# SPDX-FileCopyrightText: Copyright 2024 Sam Blenny
+"""
+AOT-compile the Table 6-24 conversion functions into a native extension.
+
+Run `python3 compile_table_6_24.py` to build a table_6_24_native extension
+module in this directory. When that module is present, table-6-24.py imports
+the compiled functions and uses them as the oracles for its lookup-table
+builds, so starting the harness costs a millisecond-scale native import
+instead of a numba JIT warmup (or JIT cache load). Without the extension,
+table-6-24.py falls back to its own jitted/pure-Python implementations.
+
+The function bodies here are copies of _dB_to_uint7_jit() and
+_uint7_to_dB_jit() in table-6-24.py (that file's hyphenated name makes it
+unimportable, so the piecewise logic can't be shared via import). If the
+piecewise math ever changes, change it in both places.
+
+Signatures use float64 (f8): float32 can't represent the tenth-dB segment
+thresholds exactly, which would shift the boundary compares.
+"""
+from numba.pycc import CC
+
+cc = CC('table_6_24_native')
+
+
+@cc.export('db_to_u7', 'i4(f8)')
+def db_to_u7(dB):
+    if dB > 0:
+        raise ValueError()
+    elif -52.7 <= dB <= 0:
+        return round((-1.99 * dB) - 0.2)
+    elif -53.7 <= dB:
+        return 106
+    elif -54.2 <= dB:
+        return 107
+    elif -55.3 <= dB:
+        return 108
+    elif -56.7 <= dB:
+        return 109
+    elif -58.3 <= dB:
+        return 110
+    elif -60.2 <= dB:
+        return 111
+    elif -62.7 <= dB:
+        return 112
+    elif -64.3 <= dB:
+        return 113
+    elif -66.2 <= dB:
+        return 114
+    elif -68.7 <= dB:
+        return 115
+    elif -72.2 <= dB:
+        return 116
+    elif -78.3 <= dB:
+        return 117
+    else:
+        raise ValueError()
+
+
+@cc.export('u7_to_db', 'f8(i4)')
+def u7_to_db(u7):
+    if u7 < 0:
+        raise ValueError()
+    if 0 == u7:
+        return 0
+    elif 0 < u7 <= 35:
+        return u7 / -2
+    elif (36 <= u7 <= 69) or (u7 == 84):
+        return (u7 / -2) - 0.1
+    elif u7 in (87, 88, 89, 91, 98, 100, 103):
+        return (u7 / -2) - 0.3
+    elif u7 in (94, 95, 102):
+        return (u7 / -2) - 0.4
+    elif u7 in (99, 101):
+        return (u7 / -2) - 0.5
+    elif 70 <= u7 <= 105:
+        return (u7 / -2) - 0.2
+    elif 106 <= u7 <= 116:
+        return (-53.7, -54.2, -55.3, -56.7, -58.3, -60.2, -62.7, -64.3,
+                -66.2, -68.7, -72.2)[u7 - 106]
+    elif 117 <= u7 <= 127:
+        return -78.3
+    else:
+        raise ValueError()
+
+
+if __name__ == "__main__":
+    cc.compile()
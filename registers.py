@@ -28,24 +28,40 @@ reg_65_0x41 = reg_66_0x42 = [
     (0b1000_0000, "reserved"),
 ]
 
+def _clip_mask(scaled_dB):
+    # Clip scaled dB to the valid register range and mask to 8 bits. This is
+    # the all-integer stage of the conversion, split out from the float math
+    # so it could be compiled with @micropython.viper on MicroPython builds
+    # that have the native emitter. CircuitPython ships without viper/native,
+    # so the decorator is left off here, but keeping the integer stage
+    # separate still avoids mixing boxed floats into the clip/mask ops.
+    return max(-127, min(48, scaled_dB)) & 0xff  # range: (-63.5*2)...(24*2)
+
+# Precomputed lookup for convert_DAC_LR_dB(): one entry per scaled half-dB
+# step, covering scaled values -127 (index 0) through +48 (index 175). Since
+# the valid input domain is this small set of discrete steps, a 176-byte
+# table built once at import replaces the clip/mask call chain with a single
+# index per conversion.
+_DAC_LUT = bytes(_clip_mask(i - 127) for i in range(176))
+
 def convert_DAC_LR_dB(dB):
     # Convert DAC volume dB in range -63.5..24 to int8 in range -127..48
     # See datasheet Table 6-77 (DAC L volume) and Table 6-78 (DAC R volume)
-    scaled_dB = round(dB * 2)
-    clipped_dB = max(-127, min(48, scaled_dB))  # range: (-63.5 * 2)...(24 * 2)
-    int8_dB = clipped_dB & 0xff
-    return int8_dB
+    return _DAC_LUT[max(0, min(175, round(dB * 2) + 127))]
 
 def check_tables_6_77_and_6_78():
     print("Table 6-77 Register 65 (0x41) (same as Table 6-78):")
-    print("\n".join(["  " + str(n) for n in reg_65_0x41]))
+    # Generator expression instead of a list comprehension: join() consumes
+    # the strings one at a time, so skip materializing the intermediate list
+    print("\n".join("  " + str(n) for n in reg_65_0x41))
     print()
     print("Output of convert_DAC_LR_dB() function:")
     for n in [25, 24, 23.5, 0.5, 0, -0.5, -63, -63.5, -64]:
         int8_dB = convert_DAC_LR_dB(n)
         print(f"{str(int8_dB):>5s} = convert_DAC_LR_dB({n:+5.1f})")
 
-check_tables_6_77_and_6_78()
+if __name__ == "__main__":
+    check_tables_6_77_and_6_78()
 """
 Table 6-77 Register 65 (0x41) (same as Table 6-78):
   (127, '-', 49, 'reserved')
@@ -79,3 +95,8 @@ Output of convert_DAC_LR_dB() function:
 #  - TLV320DAC3100.__init__()
 #  - Page0Registers.left_dac_channel_volume(self, db: float)
 #  - Page0Registers.right_dac_channel_volume(self, db: float)
+
+# Note: the *analog* volume registers (P1/R36-R38) use the non-linear
+# datasheet Table 6-24 instead of this linear int8 math. The shared packed
+# copy of that table lives in volume_tables.py (see table_6_24_v2.py for the
+# conversion functions that use it).
@@ -14,142 +14,60 @@ The table values make a non-linear piecewise function:
 2. -52.7 dB to -78 dB looks like an exponential or parabolic curve
 3. At the end, there's a constant line segment for -78.3 dB
 """
+from array import array
+from bisect import bisect_left
+import functools
+import sys
 
-# These values are transcribed from TLV320DAC3100 datasheet Table 6-24.
-# format: (Register Value for bits D6-D0, Analog Gain dB)
-table_6_24 = (
-    (  0,   0  ),  # Begin linear segment: round((-1.99 * dB) - 0.2)
-    (  1,  -0.5),
-    (  2,  -1  ),
-    (  3,  -1.5),
-    (  4,  -2  ),
-    (  5,  -2.5),
-    (  6,  -3  ),
-    (  7,  -3.5),
-    (  8,  -4  ),
-    (  9,  -4.5),
-    ( 10,  -5  ),
-    ( 11,  -5.5),
-    ( 12,  -6  ),
-    ( 13,  -6.5),
-    ( 14,  -7  ),
-    ( 15,  -7.5),
-    ( 16,  -8  ),
-    ( 17,  -8.5),
-    ( 18,  -9  ),
-    ( 19,  -9.5),
-    ( 20, -10  ),
-    ( 21, -10.5),
-    ( 22, -11  ),
-    ( 23, -11.5),
-    ( 24, -12  ),
-    ( 25, -12.5),
-    ( 26, -13  ),
-    ( 27, -13.5),
-    ( 28, -14  ),
-    ( 29, -14.5),
-    ( 30, -15  ),
-    ( 31, -15.5),
-    ( 32, -16  ),
-    ( 33, -16.5),
-    ( 34, -17  ),
-    ( 35, -17.5),
-    ( 36, -18.1),
-    ( 37, -18.6),
-    ( 38, -19.1),
-    ( 39, -19.6),
-    ( 40, -20.1),
-    ( 41, -20.6),
-    ( 42, -21.1),
-    ( 43, -21.6),
-    ( 44, -22.1),
-    ( 45, -22.6),
-    ( 46, -23.1),
-    ( 47, -23.6),
-    ( 48, -24.1),
-    ( 49, -24.6),
-    ( 50, -25.1),
-    ( 51, -25.6),
-    ( 52, -26.1),
-    ( 53, -26.6),
-    ( 54, -27.1),
-    ( 55, -27.6),
-    ( 56, -28.1),
-    ( 57, -28.6),
-    ( 58, -29.1),
-    ( 59, -29.6),
-    ( 60, -30.1),
-    ( 61, -30.6),
-    ( 62, -31.1),
-    ( 63, -31.6),
-    ( 64, -32.1),
-    ( 65, -32.6),
-    ( 66, -33.1),
-    ( 67, -33.6),
-    ( 68, -34.1),
-    ( 69, -34.6),
-    ( 70, -35.2),
-    ( 71, -35.7),
-    ( 72, -36.2),
-    ( 73, -36.7),
-    ( 74, -37.2),
-    ( 75, -37.7),
-    ( 76, -38.2),
-    ( 77, -38.7),
-    ( 78, -39.2),
-    ( 79, -39.7),
-    ( 80, -40.2),
-    ( 81, -40.7),
-    ( 82, -41.2),
-    ( 83, -41.7),
-    ( 84, -42.1),
-    ( 85, -42.7),
-    ( 86, -43.2),
-    ( 87, -43.8),
-    ( 88, -44.3),
-    ( 89, -44.8),
-    ( 90, -45.2),
-    ( 91, -45.8),
-    ( 92, -46.2),
-    ( 93, -46.7),
-    ( 94, -47.4),
-    ( 95, -47.9),
-    ( 96, -48.2),
-    ( 97, -48.7),
-    ( 98, -49.3),
-    ( 99, -50  ),
-    (100, -50.3),
-    (101, -51  ),
-    (102, -51.4),
-    (103, -51.8),
-    (104, -52.2),
-    (105, -52.7),  # End linear segment: round((-1.99 * dB) - 0.2)
-    (106, -53.7),  # Begin curved segment
-    (107, -54.2),
-    (108, -55.3),
-    (109, -56.7),
-    (110, -58.3),
-    (111, -60.2),
-    (112, -62.7),
-    (113, -64.3),
-    (114, -66.2),
-    (115, -68.7),
-    (116, -72.2),  # End curved segment
-    (117, -78.3),  # Begin constant segment -78.3 dB
-    (118, -78.3),
-    (119, -78.3),
-    (120, -78.3),
-    (121, -78.3),
-    (122, -78.3),
-    (123, -78.3),
-    (124, -78.3),
-    (125, -78.3),
-    (126, -78.3),
-    (127, -78.3),
-)
+import numpy as np
 
+from volume_tables import HP_DB_X10
+try:
+    from numba import njit
+except ImportError:
+    njit = None  # numba is optional; plain CPython fallback below
 
-def convert_dB_to_uint7_table_6_24(dB):
+try:
+    # Optional AOT-compiled versions of the conversion kernels, built by
+    # running `python3 compile_table_6_24.py`. Importing the prebuilt native
+    # module takes milliseconds, versus the JIT warmup (or cache load) that
+    # compiling the kernels below would cost at first call.
+    import table_6_24_native as _native
+except ImportError:
+    _native = None
+
+
+def _jit(fn):
+    """
+    Decorate fn with numba @njit(cache=True) when numba is installed, or
+    return fn unchanged so everything still runs as plain CPython without it.
+    Lazy compilation (no explicit signature) is deliberate: an
+    int32(float32) signature would round the tenth-dB segment thresholds to
+    float32 and shift the boundary compares (float32(-52.7) sorts below
+    -52.7), so let numba specialize on float64 at the first call instead.
+    cache=True persists compiled code to disk, skipping recompile latency on
+    later runs.
+    """
+    if njit is None:
+        return fn
+    return njit(cache=True)(fn)
+
+
+# Reference table columns as structure-of-arrays: the register values for
+# bits D6-D0 are just 0..127 in order (so an arange), and the dB column
+# derives from the shared packed transcription in volume_tables.py (tenth-dB
+# ints in an array('h'), 256 bytes frozen storage with no per-element Python
+# object overhead). Dividing by 10 recovers the exact float64 gain values.
+_TBL_REG = np.arange(128, dtype=np.uint8)
+_TBL_DB = np.asarray(HP_DB_X10, dtype=np.float64) / 10
+
+# Backward-compatible view in the old list-of-tuples format, for anything
+# that still wants (reg, dB) pairs
+table_6_24 = tuple(zip(_TBL_REG.tolist(), _TBL_DB.tolist()))
+
+
+@_jit
+def _dB_to_uint7_jit(dB):
     """
     Convert analog gain dB to 7-bit unsigned int to match datasheet Table 6-24.
     Valid gain dB range is -78.3 dB to 0 dB.
@@ -197,13 +115,11 @@ def convert_dB_to_uint7_table_6_24(dB):
     else:
         raise ValueError()
 
-def convert_uint7_to_dB_table_6_24(u7):
-    """
-    Convert 7-bit unsigned int to analog gain to match datasheet Table 6-24.
-    Valid values for u7 are integers in range 0 to 127.
-    """
-    if (u7 < 0) or (not isinstance(u7, int)):
-        raise ValueError()
+@_jit
+def _uint7_to_dB_jit(u7):
+    # Piecewise evaluation for convert_uint7_to_dB_table_6_24(), split out so
+    # the isinstance() validation (which numba's nopython mode can't compile)
+    # stays in the plain-Python wrapper below
     if 0 == u7:
         return 0
     elif 0 < u7 <= 35:
@@ -233,26 +149,198 @@ def convert_uint7_to_dB_table_6_24(u7):
     else:
         raise ValueError()
 
+# Oracles for the lookup-table builds below: prefer the AOT-compiled native
+# functions when the extension has been built, falling back to the jitted
+# (or plain Python) kernels above. With the native module present, the lazy
+# @_jit kernels are never called, so numba does no compiling at all.
+if _native is not None:
+    _dB_to_uint7_oracle = _native.db_to_u7
+    _uint7_to_dB_oracle = _native.u7_to_db
+else:
+    _dB_to_uint7_oracle = _dB_to_uint7_jit
+    _uint7_to_dB_oracle = _uint7_to_dB_jit
+
+@functools.cache
+def _build_luts():
+    """
+    Build both precomputed lookup tables on first use and cache them.
+    Returns (db_to_u7, u7_to_db):
+    - db_to_u7: uint8[784], one entry per tenth-dB step from 0 dB (index 0)
+      down to -78.3 dB (index 783). Inputs quantize to the nearest tenth-dB
+      before lookup, matching the granularity of the datasheet table.
+    - u7_to_db: float64[128], one entry per register value. float64 keeps
+      the tenth-dB values exact, same as everywhere else here.
+    functools.cache makes this a lazy singleton, so importing the module for
+    a single conversion doesn't pay the 912 oracle calls (plus their JIT
+    compile or cache load, when the AOT extension isn't built) up front.
+    """
+    db_to_u7 = np.fromiter(
+        (_dB_to_uint7_oracle(-i / 10.0) for i in range(784)),
+        dtype=np.uint8, count=784)
+    u7_to_db = np.fromiter(
+        (_uint7_to_dB_oracle(i) for i in range(128)), dtype=np.float64,
+        count=128)
+    return (db_to_u7, u7_to_db)
+
+def convert_dB_to_uint7_table_6_24(dB):
+    """
+    Convert analog gain dB to 7-bit unsigned int to match datasheet Table 6-24.
+    Valid gain dB range is -78.3 dB to 0 dB.
+    """
+    if (dB > 0) or (dB < -78.3):
+        raise ValueError()
+    return _build_luts()[0][int((-dB * 10) + 0.5)]
+
+# Negated dB column, ascending, as a C double array for bisect's
+# C-implemented binary search. Type code 'd' matters: float32 storage can't
+# represent the tenth-dB values exactly, which would break the equality hits
+# that make exact table values land on their own register index.
+_NEG_DB_SORTED = array('d', (-x / 10 for x in HP_DB_X10))
+
+def convert_dB_to_uint7_bisect(dB):
+    """
+    Alternative dB to uint7 conversion: binary search over the negated dB
+    column, O(log 128) = 7 compares all in C. Kept as an independent
+    cross-check of the LUT path. For dB values between table entries this
+    rounds toward the next quieter step, while the piecewise formula rounds
+    to nearest on the linear segment, so the two are only required to agree
+    on table grid values (asserted below).
+    """
+    # min() clamps the -78.3 dB plateau: indices 117-127 share one key and
+    # bisect_left already lands on 117, the first of them
+    return min(117, bisect_left(_NEG_DB_SORTED, -dB))
+
+# The uint7 -> dB direction also goes through the cached LUT: the whole
+# domain is just 128 integers, so a 1 KB float64 table (stays hot in L1)
+# turns each conversion into a single array index instead of ~6 branch
+# compares plus arithmetic.
+def convert_uint7_to_dB_table_6_24(u7):
+    """
+    Convert 7-bit unsigned int to analog gain to match datasheet Table 6-24.
+    Valid values for u7 are integers in range 0 to 127.
+    """
+    if (u7 < 0) or (u7 > 127) or (not isinstance(u7, int)):
+        raise ValueError()
+    return _build_luts()[1][u7]
+
+# (No JIT warmup calls needed here: the first _build_luts() call warms both
+# kernels and absorbs the compile/cache-load latency.)
+
+
+def convert_dB_to_uint7_np(dB):
+    """
+    Vectorized version of convert_dB_to_uint7_table_6_24() for NumPy arrays.
+    One array pass replaces a Python-level call (dozens of bytecode
+    dispatches) per element. float64 keeps the linear-segment rounding
+    identical to the scalar reference.
+    """
+    dB = np.asarray(dB, dtype=np.float64)
+    if np.any(dB > 0) or np.any(dB < -78.3):
+        raise ValueError()
+    # One vectorized gather out of the tenth-dB LUT (the piecewise
+    # rint/searchsorted evaluation this replaces survives in the scalar
+    # _dB_to_uint7_jit oracle that builds the LUT)
+    return _build_luts()[0][np.clip(((-dB * 10) + 0.5).astype(np.int32), 0,
+                                    783)].astype(np.int64)
+
+# Segment tables for branchless vectorized uint7 -> dB evaluation. Each
+# register value maps through _U7_SEG to a segment index, and each segment
+# is a (slope, intercept) pair evaluated as intercept + u7 * slope. The
+# linear/jitter segments share slope -0.5 with different intercept trims,
+# the 11 curved-segment register values each get a constant (slope 0)
+# segment of their own, and the -78.3 dB plateau is one more constant
+# segment: 19 segments total.
+_SEG_SLOPE = np.concatenate((
+    np.array([0.0, -0.5, -0.5, -0.5, -0.5, -0.5, -0.5]),  # segments 0-6
+    np.zeros(12),                                         # curve + plateau
+))
+_SEG_INTCPT = np.concatenate((
+    np.array([0.0, 0.0, -0.1, -0.3, -0.4, -0.5, -0.2]),   # segments 0-6
+    np.array([-53.7, -54.2, -55.3, -56.7, -58.3, -60.2,   # segments 7-17
+              -62.7, -64.3, -66.2, -68.7, -72.2]),
+    np.array([-78.3]),                                    # segment 18
+))
+_U7_SEG = np.empty(128, dtype=np.uint8)
+_U7_SEG[0] = 0
+_U7_SEG[1:36] = 1
+_U7_SEG[36:70] = 2
+_U7_SEG[70:106] = 6       # default for the jittery middle, then trims:
+_U7_SEG[84] = 2
+_U7_SEG[[87, 88, 89, 91, 98, 100, 103]] = 3
+_U7_SEG[[94, 95, 102]] = 4
+_U7_SEG[[99, 101]] = 5
+_U7_SEG[106:117] = np.arange(7, 18)
+_U7_SEG[117:] = 18
+
+def convert_uint7_to_dB_np(u7):
+    """
+    Vectorized version of convert_uint7_to_dB_table_6_24() for NumPy arrays.
+    Branchless: one gather for the segment index, one more for the segment
+    slope/intercept, then a fused multiply-add. Slopes are exact halves and
+    intercept trims match the scalar arithmetic, so results are still
+    bit-identical to the piecewise reference.
+    """
+    u7 = np.asarray(u7, dtype=np.int64)
+    if np.any(u7 < 0) or np.any(u7 > 127):
+        raise ValueError()
+    s = _U7_SEG[u7]
+    return _SEG_INTCPT[s] + u7 * _SEG_SLOPE[s]
+
+
+def _run_tests():
+    # Cross-check the two independent forward implementations on every
+    # table row
+    assert all(
+        convert_dB_to_uint7_bisect(d) == convert_dB_to_uint7_table_6_24(d)
+        for d in _TBL_DB)
+
+    # Run both conversion directions over the SoA columns as single vectorized
+    # calls so the print loops below only do I/O formatting
+    tbl_vals = _TBL_REG
+    tbl_dB = _TBL_DB
+    computed_u7 = convert_dB_to_uint7_np(tbl_dB)
+    diff_u7 = computed_u7 - tbl_vals
+    computed_dB = convert_uint7_to_dB_np(tbl_vals)
+    diff_dB = computed_dB - tbl_dB
+
+    # Format each report column with one vectorized np.char.mod call instead of
+    # ~500 per-row "%.1f" % x invocations inside the print loops
+    s_tbl_dB = np.char.mod("%.1f", tbl_dB)
+    s_diff_u7 = np.char.mod("%d", diff_u7)
+    s_computed_dB = np.char.mod("%.1f", computed_dB)
+    s_diff_dB = np.char.mod("%.1f", diff_dB)
+
+
+    # Test both conversion directions against the table values. One fused pass
+    # assembles the rows for both reports (halving the iteration overhead), then
+    # each report prints as a single joined string instead of a print per row.
+    # Row templates bound once at module scope: str.format parses the format
+    # mini-language per call site, so binding the parsed template's format
+    # method avoids re-reading the spec on every row
+    _ROW_FWD = "{:>5} dB     {:3d}    {:3d}      {:>3}".format
+    _ROW_INV = "{:3d}       {:>5}    {:>5}      {:>3}".format
+
+    buf_fwd = [
+        " Gain_dB  Table    Computed  Reg Val",
+        "          Reg Val  Reg Val   Diff",
+    ]
+    buf_inv = [
+        " Table    Table    Computed  Gain_dB",
+        " Reg Val  Gain_dB  Gain_dB   Diff",
+    ]
+    for i in range(len(tbl_vals)):
+        (table_val, uint7) = (tbl_vals[i], computed_u7[i])
+        buf_fwd.append(_ROW_FWD(s_tbl_dB[i], table_val, uint7, s_diff_u7[i]))
+        buf_inv.append(_ROW_INV(table_val, s_tbl_dB[i], s_computed_dB[i],
+                                s_diff_dB[i]))
+    # Write the whole report with a single stdout call (instead of one print per
+    # row or section), which matters most when stdout is a pipe
+    sys.stdout.write("\n".join(buf_fwd + [""] + buf_inv))
+    sys.stdout.write("\n")
+
 
-# Test dB to uint7 conversion function by comparing to values from the table
-print(" Gain_dB  Table    Computed  Reg Val")
-print("          Reg Val  Reg Val   Diff")
-for (table_val, table_dB) in table_6_24:
-    uint7 = convert_dB_to_uint7_table_6_24(table_dB)
-    dB_str = str("%.1f" % table_dB)
-    diff = str(uint7 - table_val)
-    print(f"{dB_str:>5} dB     {table_val:3d}    {uint7:3d}      {diff:>3}")
-print()
-
-# Test uint7 to dB conversion function by comparing to values from the table
-print(" Table    Table    Computed  Gain_dB")
-print(" Reg Val  Gain_dB  Gain_dB   Diff")
-for (table_val, table_dB) in table_6_24:
-    computed_dB = convert_uint7_to_dB_table_6_24(table_val)
-    t_dB = str("%.1f" % table_dB)
-    c_dB = str("%.1f" % computed_dB)
-    diff = str("%.1f" % (computed_dB - table_dB))
-    print(f"{table_val:3d}       {t_dB:>5}    {c_dB:>5}      {diff:>3}")
+if __name__ == "__main__":
+    _run_tests()
 
 
 # The output below is from running the two test loops above.
@@ -14,6 +14,10 @@ The table values make a non-linear piecewise function:
 2. -52.7 dB to -78 dB looks like an exponential or parabolic curve
 3. At the end, there's a constant line segment for -78.3 dB
 """
+from array import array
+from bisect import bisect_left
+
+from volume_tables import HP_DB_X10
 
 
 # ============================================================================
@@ -21,136 +25,13 @@ The table values make a non-linear piecewise function:
 # ============================================================================
 
 
-# These values are transcribed from TLV320DAC3100 datasheet Table 6-24.
-TABLE_6_24 = (
-      0,    #   0  Begin linear segment: round((-1.99 * dB) - 0.2)
-     -0.5,  #   1
-     -1,    #   2
-     -1.5,  #   3
-     -2,    #   4
-     -2.5,  #   5
-     -3,    #   6
-     -3.5,  #   7
-     -4,    #   8
-     -4.5,  #   9
-     -5,    #  10
-     -5.5,  #  11
-     -6,    #  12
-     -6.5,  #  13
-     -7,    #  14
-     -7.5,  #  15
-     -8,    #  16
-     -8.5,  #  17
-     -9,    #  18
-     -9.5,  #  19
-    -10,    #  20
-    -10.5,  #  21
-    -11,    #  22
-    -11.5,  #  23
-    -12,    #  24
-    -12.5,  #  25
-    -13,    #  26
-    -13.5,  #  27
-    -14,    #  28
-    -14.5,  #  29
-    -15,    #  30
-    -15.5,  #  31
-    -16,    #  32
-    -16.5,  #  33
-    -17,    #  34
-    -17.5,  #  35
-    -18.1,  #  36
-    -18.6,  #  37
-    -19.1,  #  38
-    -19.6,  #  39
-    -20.1,  #  40
-    -20.6,  #  41
-    -21.1,  #  42
-    -21.6,  #  43
-    -22.1,  #  44
-    -22.6,  #  45
-    -23.1,  #  46
-    -23.6,  #  47
-    -24.1,  #  48
-    -24.6,  #  49
-    -25.1,  #  50
-    -25.6,  #  51
-    -26.1,  #  52
-    -26.6,  #  53
-    -27.1,  #  54
-    -27.6,  #  55
-    -28.1,  #  56
-    -28.6,  #  57
-    -29.1,  #  58
-    -29.6,  #  59
-    -30.1,  #  60
-    -30.6,  #  61
-    -31.1,  #  62
-    -31.6,  #  63
-    -32.1,  #  64
-    -32.6,  #  65
-    -33.1,  #  66
-    -33.6,  #  67
-    -34.1,  #  68
-    -34.6,  #  69
-    -35.2,  #  70
-    -35.7,  #  71
-    -36.2,  #  72
-    -36.7,  #  73
-    -37.2,  #  74
-    -37.7,  #  75
-    -38.2,  #  76
-    -38.7,  #  77
-    -39.2,  #  78
-    -39.7,  #  79
-    -40.2,  #  80
-    -40.7,  #  81
-    -41.2,  #  82
-    -41.7,  #  83
-    -42.1,  #  84
-    -42.7,  #  85
-    -43.2,  #  86
-    -43.8,  #  87
-    -44.3,  #  88
-    -44.8,  #  89
-    -45.2,  #  90
-    -45.8,  #  91
-    -46.2,  #  92
-    -46.7,  #  93
-    -47.4,  #  94
-    -47.9,  #  95
-    -48.2,  #  96
-    -48.7,  #  97
-    -49.3,  #  98
-    -50,    #  99
-    -50.3,  # 100
-    -51,    # 101
-    -51.4,  # 102
-    -51.8,  # 103
-    -52.2,  # 104
-    -52.7,  # 105  End linear segment: round((-1.99 * dB) - 0.2)
-    -53.7,  # 106  Begin curved segment
-    -54.2,  # 107
-    -55.3,  # 108
-    -56.7,  # 109
-    -58.3,  # 110
-    -60.2,  # 111
-    -62.7,  # 112
-    -64.3,  # 113
-    -66.2,  # 114
-    -68.7,  # 115
-    -72.2,  # 116  End curved segment
-    -78.3,  # 117  Begin constant segment -78.3 dB
-    -78.3,  # 118
-    -78.3,  # 119
-    -78.3,  # 120
-    -78.3,  # 121
-    -78.3,  # 122
-    -78.3,  # 123
-    -78.3,  # 124
-    -78.3,  # 125
-    -78.3,  # 126
-    -78.3,  # 127
+
+# Curved segment of Table 6-24: gain dB for register values 106 to 116. The
+# linear formula below doesn't fit this part of the table, and there aren't
+# enough points to be worth curve fitting, so keep a small lookup tuple.
+CURVE_6_24 = (
+    -53.7, -54.2, -55.3, -56.7, -58.3, -60.2, -62.7, -64.3, -66.2, -68.7,
+    -72.2,
 )
 
 def table_6_24_dB_to_uint7(dB):
@@ -160,188 +41,91 @@ def table_6_24_dB_to_uint7(dB):
     """
     # Clip dB argument to fit in the valid range if it's too big or too small
     dB = max(-78.3, min(0, dB))
-    # Loop through the table, looking for the lowest table index where the
-    # target dB value is not greater than the table dB value
-    result = 0
-    for (table_uint7, table_dB) in enumerate(TABLE_6_24):
-        if dB < table_dB:
-            result = table_uint7
-        elif dB == table_dB:
-            result = table_uint7
-            break
-        else:
-            break
-    return result
+    if dB >= -52.7:
+        # Linear segment (register values 0..105). The table values jitter on
+        # the order of ±0.3 away from a straight line, but round() with this
+        # formula reproduces every entry of the linear segment exactly.
+        return max(0, min(105, round((-1.99 * dB) - 0.2)))
+    elif dB >= -72.2:
+        # Curved segment (register values 106..116): check the small lookup
+        # tuple, taking the first entry that dB is not quieter than
+        for (i, curve_dB) in enumerate(CURVE_6_24):
+            if dB >= curve_dB:
+                return 106 + i
+        return 116
+    else:
+        # Constant segment: Table 6-24 says register values 117-127 are all
+        # -78.3 dB. Since we need a single value, pick 117.
+        return 117
+
+# Monotonic binary-search keys derived from the shared packed table: negated
+# tenth-dB values, ascending from 0 (0 dB) to 783 (-78.3 dB)
+_KEYS_X10 = array('h', (-v for v in HP_DB_X10))
+
+def table_6_24_dB_to_uint7_bisect(dB):
+    """
+    Alternative dB to uint7 conversion using binary search over the packed
+    table: 7 compares instead of a 128-entry linear scan. Kept as a
+    cross-check for the closed-form table_6_24_dB_to_uint7() above; the test
+    code below asserts that the two agree for every register value in the
+    table. For dB values in between table entries the rounding may differ
+    from the closed form, which rounds to nearest on the linear segment.
+    """
+    k = round(max(-78.3, min(0, dB)) * -10)
+    # min() clamps the -78.3 dB plateau (indices 117-127 share one key value,
+    # and bisect_left already lands on 117, the first of them)
+    return min(117, bisect_left(_KEYS_X10, k))
+
 
 def table_6_24_uint7_to_dB(u7):
     """
     Convert 7-bit unsigned int to analog gain to match datasheet Table 6-24.
     Valid values for u7 are integers in range 0 to 127.
     """
-    return TABLE_6_24[max(0, min(127, int(u7)))]
+    return HP_DB_X10[max(0, min(127, int(u7)))] / 10
 
 
 # =============================================================================
 # == End of lookup table based conversion implementation, start of test data ==
 # =============================================================================
 
-# These values are transcribed from TLV320DAC3100 datasheet Table 6-24.
-# format: (Register Value for bits D6-D0, Analog Gain dB)
-table_6_24 = (
-    (  0,   0  ),  # Begin linear segment: round((-1.99 * dB) - 0.2)
-    (  1,  -0.5),
-    (  2,  -1  ),
-    (  3,  -1.5),
-    (  4,  -2  ),
-    (  5,  -2.5),
-    (  6,  -3  ),
-    (  7,  -3.5),
-    (  8,  -4  ),
-    (  9,  -4.5),
-    ( 10,  -5  ),
-    ( 11,  -5.5),
-    ( 12,  -6  ),
-    ( 13,  -6.5),
-    ( 14,  -7  ),
-    ( 15,  -7.5),
-    ( 16,  -8  ),
-    ( 17,  -8.5),
-    ( 18,  -9  ),
-    ( 19,  -9.5),
-    ( 20, -10  ),
-    ( 21, -10.5),
-    ( 22, -11  ),
-    ( 23, -11.5),
-    ( 24, -12  ),
-    ( 25, -12.5),
-    ( 26, -13  ),
-    ( 27, -13.5),
-    ( 28, -14  ),
-    ( 29, -14.5),
-    ( 30, -15  ),
-    ( 31, -15.5),
-    ( 32, -16  ),
-    ( 33, -16.5),
-    ( 34, -17  ),
-    ( 35, -17.5),
-    ( 36, -18.1),
-    ( 37, -18.6),
-    ( 38, -19.1),
-    ( 39, -19.6),
-    ( 40, -20.1),
-    ( 41, -20.6),
-    ( 42, -21.1),
-    ( 43, -21.6),
-    ( 44, -22.1),
-    ( 45, -22.6),
-    ( 46, -23.1),
-    ( 47, -23.6),
-    ( 48, -24.1),
-    ( 49, -24.6),
-    ( 50, -25.1),
-    ( 51, -25.6),
-    ( 52, -26.1),
-    ( 53, -26.6),
-    ( 54, -27.1),
-    ( 55, -27.6),
-    ( 56, -28.1),
-    ( 57, -28.6),
-    ( 58, -29.1),
-    ( 59, -29.6),
-    ( 60, -30.1),
-    ( 61, -30.6),
-    ( 62, -31.1),
-    ( 63, -31.6),
-    ( 64, -32.1),
-    ( 65, -32.6),
-    ( 66, -33.1),
-    ( 67, -33.6),
-    ( 68, -34.1),
-    ( 69, -34.6),
-    ( 70, -35.2),
-    ( 71, -35.7),
-    ( 72, -36.2),
-    ( 73, -36.7),
-    ( 74, -37.2),
-    ( 75, -37.7),
-    ( 76, -38.2),
-    ( 77, -38.7),
-    ( 78, -39.2),
-    ( 79, -39.7),
-    ( 80, -40.2),
-    ( 81, -40.7),
-    ( 82, -41.2),
-    ( 83, -41.7),
-    ( 84, -42.1),
-    ( 85, -42.7),
-    ( 86, -43.2),
-    ( 87, -43.8),
-    ( 88, -44.3),
-    ( 89, -44.8),
-    ( 90, -45.2),
-    ( 91, -45.8),
-    ( 92, -46.2),
-    ( 93, -46.7),
-    ( 94, -47.4),
-    ( 95, -47.9),
-    ( 96, -48.2),
-    ( 97, -48.7),
-    ( 98, -49.3),
-    ( 99, -50  ),
-    (100, -50.3),
-    (101, -51  ),
-    (102, -51.4),
-    (103, -51.8),
-    (104, -52.2),
-    (105, -52.7),  # End linear segment: round((-1.99 * dB) - 0.2)
-    (106, -53.7),  # Begin curved segment
-    (107, -54.2),
-    (108, -55.3),
-    (109, -56.7),
-    (110, -58.3),
-    (111, -60.2),
-    (112, -62.7),
-    (113, -64.3),
-    (114, -66.2),
-    (115, -68.7),
-    (116, -72.2),  # End curved segment
-    (117, -78.3),  # Begin constant segment -78.3 dB
-    (118, -78.3),
-    (119, -78.3),
-    (120, -78.3),
-    (121, -78.3),
-    (122, -78.3),
-    (123, -78.3),
-    (124, -78.3),
-    (125, -78.3),
-    (126, -78.3),
-    (127, -78.3),
-)
+def run_tests():
+    # Test data and test loops live in this function (instead of at module
+    # scope) so importing the conversion functions costs no test-table RAM
+    # and prints nothing.
+    # Test pairs in the format of datasheet Table 6-24: (Register Value for bits
+    # D6-D0, Analog Gain dB). Generated from the shared packed table instead of
+    # keeping a second near-verbatim transcription resident after import.
+    table_6_24 = tuple((u7, dB_x10 / 10) for (u7, dB_x10) in enumerate(HP_DB_X10))
 
 
-# =============================================================================
-# == End of test data, start of test Code =====================================
-# =============================================================================
+    # =============================================================================
+    # == End of test data, start of test Code =====================================
+    # =============================================================================
+
+    # Test dB to uint7 conversion function by comparing to values from the table
+    print(" Gain_dB  Table    Computed  Reg Val")
+    print("          Reg Val  Reg Val   Diff")
+    for (table_val, table_dB) in table_6_24:
+        uint7 = table_6_24_dB_to_uint7(table_dB)
+        assert table_6_24_dB_to_uint7_bisect(table_dB) == uint7, table_dB
+        dB_str = str("%.1f" % table_dB)
+        diff = str(uint7 - table_val)
+        print(f"{dB_str:>5} dB     {table_val:3d}    {uint7:3d}      {diff:>3}")
+    print()
 
-# Test dB to uint7 conversion function by comparing to values from the table
-print(" Gain_dB  Table    Computed  Reg Val")
-print("          Reg Val  Reg Val   Diff")
-for (table_val, table_dB) in table_6_24:
-    uint7 = table_6_24_dB_to_uint7(table_dB)
-    dB_str = str("%.1f" % table_dB)
-    diff = str(uint7 - table_val)
-    print(f"{dB_str:>5} dB     {table_val:3d}    {uint7:3d}      {diff:>3}")
-print()
+    # Test uint7 to dB conversion function by comparing to values from the table
+    print(" Table    Table    Computed  Gain_dB")
+    print(" Reg Val  Gain_dB  Gain_dB   Diff")
+    for (table_val, table_dB) in table_6_24:
+        computed_dB = table_6_24_uint7_to_dB(table_val)
+        t_dB = str("%.1f" % table_dB)
+        c_dB = str("%.1f" % computed_dB)
+        diff = str("%.1f" % (computed_dB - table_dB))
+        print(f"{table_val:3d}       {t_dB:>5}    {c_dB:>5}      {diff:>3}")
 
-# Test uint7 to dB conversion function by comparing to values from the table
-print(" Table    Table    Computed  Gain_dB")
-print(" Reg Val  Gain_dB  Gain_dB   Diff")
-for (table_val, table_dB) in table_6_24:
-    computed_dB = table_6_24_uint7_to_dB(table_val)
-    t_dB = str("%.1f" % table_dB)
-    c_dB = str("%.1f" % computed_dB)
-    diff = str("%.1f" % (computed_dB - table_dB))
-    print(f"{table_val:3d}       {t_dB:>5}    {c_dB:>5}      {diff:>3}")
+if __name__ == "__main__":
+    run_tests()
 
 
 # The output below is from running the two test loops above.
@@ -0,0 +1,154 @@
+# SPDX-License-Identifier: MIT
+# SPDX-FileCopyrightText: Copyright 2024 Sam Blenny
+"""
+Shared packed volume conversion table for the TLV320DAC3100.
+
+HP_DB_X10 holds the analog gain values from datasheet Table 6-24, "Analog
+Volume Control for Headphone and Speaker Outputs", which applies to these
+registers:
+- P1/R36=0x24 Left  Analog Volume to HPL (range 0 dB to -78 dB)
+- P1/R37=0x25 Right Analog Volume to HPR (range 0 dB to -78 dB)
+- P1/R38=0x26 Left  Analog Volume to SPK (range 0 dB to -78 dB)
+
+Keeping the one packed copy here means modules that need the table can share
+it instead of each holding their own. The DAC digital volume registers
+(P0/R65=0x41, P0/R66=0x42) don't need a table: they use linear int8 math, see
+convert_DAC_LR_dB() in registers.py.
+"""
+from array import array
+
+
+# These values are transcribed from TLV320DAC3100 datasheet Table 6-24, then
+# scaled by 10 so each gain value fits in a 16-bit signed int (tenth-dB steps).
+# Packing the table as array('h') instead of a tuple of floats cuts its RAM
+# footprint by roughly 10x on CircuitPython. Divide by 10 to recover gain dB.
+HP_DB_X10 = array('h', (
+        0,  # 0  Begin linear segment: round((-1.99 * dB) - 0.2)
+       -5,  # 1
+      -10,  # 2
+      -15,  # 3
+      -20,  # 4
+      -25,  # 5
+      -30,  # 6
+      -35,  # 7
+      -40,  # 8
+      -45,  # 9
+      -50,  # 10
+      -55,  # 11
+      -60,  # 12
+      -65,  # 13
+      -70,  # 14
+      -75,  # 15
+      -80,  # 16
+      -85,  # 17
+      -90,  # 18
+      -95,  # 19
+     -100,  # 20
+     -105,  # 21
+     -110,  # 22
+     -115,  # 23
+     -120,  # 24
+     -125,  # 25
+     -130,  # 26
+     -135,  # 27
+     -140,  # 28
+     -145,  # 29
+     -150,  # 30
+     -155,  # 31
+     -160,  # 32
+     -165,  # 33
+     -170,  # 34
+     -175,  # 35
+     -181,  # 36
+     -186,  # 37
+     -191,  # 38
+     -196,  # 39
+     -201,  # 40
+     -206,  # 41
+     -211,  # 42
+     -216,  # 43
+     -221,  # 44
+     -226,  # 45
+     -231,  # 46
+     -236,  # 47
+     -241,  # 48
+     -246,  # 49
+     -251,  # 50
+     -256,  # 51
+     -261,  # 52
+     -266,  # 53
+     -271,  # 54
+     -276,  # 55
+     -281,  # 56
+     -286,  # 57
+     -291,  # 58
+     -296,  # 59
+     -301,  # 60
+     -306,  # 61
+     -311,  # 62
+     -316,  # 63
+     -321,  # 64
+     -326,  # 65
+     -331,  # 66
+     -336,  # 67
+     -341,  # 68
+     -346,  # 69
+     -352,  # 70
+     -357,  # 71
+     -362,  # 72
+     -367,  # 73
+     -372,  # 74
+     -377,  # 75
+     -382,  # 76
+     -387,  # 77
+     -392,  # 78
+     -397,  # 79
+     -402,  # 80
+     -407,  # 81
+     -412,  # 82
+     -417,  # 83
+     -421,  # 84
+     -427,  # 85
+     -432,  # 86
+     -438,  # 87
+     -443,  # 88
+     -448,  # 89
+     -452,  # 90
+     -458,  # 91
+     -462,  # 92
+     -467,  # 93
+     -474,  # 94
+     -479,  # 95
+     -482,  # 96
+     -487,  # 97
+     -493,  # 98
+     -500,  # 99
+     -503,  # 100
+     -510,  # 101
+     -514,  # 102
+     -518,  # 103
+     -522,  # 104
+     -527,  # 105  End linear segment: round((-1.99 * dB) - 0.2)
+     -537,  # 106  Begin curved segment
+     -542,  # 107
+     -553,  # 108
+     -567,  # 109
+     -583,  # 110
+     -602,  # 111
+     -627,  # 112
+     -643,  # 113
+     -662,  # 114
+     -687,  # 115
+     -722,  # 116  End curved segment
+     -783,  # 117  Begin constant segment -78.3 dB
+     -783,  # 118
+     -783,  # 119
+     -783,  # 120
+     -783,  # 121
+     -783,  # 122
+     -783,  # 123
+     -783,  # 124
+     -783,  # 125
+     -783,  # 126
+     -783,  # 127
+))